@@ -0,0 +1,227 @@
+import argparse
+import os
+from datetime import datetime
+import logging
+import pandas as pd
+from logger import setup_logging
+
+logger = logging.getLogger(__name__)
+
+TRADE_LOG_FILE = 'trade_log.txt'
+REPORT_DIR = 'reports'
+TICKS_DIR = 'ticks'
+
+NUMERIC_FIELDS = [
+    'entry_price', 'entry_option_price', 'exit_price', 'exit_option_price',
+    'quantity', 'profit_absolute', 'option_profit', 'profit_percentage'
+]
+
+def iter_trade_log(log_file=TRADE_LOG_FILE):
+    """Stream trade entries written by log_trade, one dict per trade"""
+    entry = None
+    with open(log_file, 'r') as f:
+        for line in f:
+            line = line.rstrip('\n')
+            if line.startswith('Trade Log Entry - '):
+                if entry:
+                    yield entry
+                entry = {'logged_at': line[len('Trade Log Entry - '):]}
+            elif entry is not None and ': ' in line:
+                key, value = line.split(': ', 1)
+                entry[key] = value
+    if entry:
+        yield entry
+
+def load_trades(log_file=TRADE_LOG_FILE):
+    """Load the full trade history into a typed DataFrame"""
+    trades = pd.DataFrame.from_records(iter_trade_log(log_file))
+    if trades.empty:
+        return trades
+
+    # Older entries were written before the option leg was logged
+    for field in NUMERIC_FIELDS:
+        if field not in trades:
+            trades[field] = float('nan')
+        trades[field] = pd.to_numeric(trades[field].replace('None', None), errors='coerce')
+
+    for field in ['entry_datetime', 'exit_datetime']:
+        trades[field] = pd.to_datetime(trades[field], format='%Y-%m-%d %H:%M:%S')
+
+    return trades.sort_values('exit_datetime').reset_index(drop=True)
+
+def open_tick_recorder(ticks_dir=TICKS_DIR, date=None):
+    """Open today's tick file for appending 'timestamp,ltp' rows"""
+    if date is None:
+        date = datetime.now()
+    os.makedirs(ticks_dir, exist_ok=True)
+    ticks_file = os.path.join(ticks_dir, f"{date.strftime('%Y-%m-%d')}.csv")
+    is_new = not os.path.exists(ticks_file)
+    f = open(ticks_file, 'a', buffering=1)
+    if is_new:
+        f.write("timestamp,ltp\n")
+    return f
+
+def load_ticks(ticks_dir, dates):
+    """Load recorded ticks (timestamp, ltp) for the given trade dates, sorted by time"""
+    # One file per session, so only the days that had trades are read
+    frames = []
+    for date in sorted(set(dates)):
+        ticks_file = os.path.join(ticks_dir, f"{date.strftime('%Y-%m-%d')}.csv")
+        if os.path.exists(ticks_file):
+            frames.append(pd.read_csv(ticks_file, usecols=['timestamp', 'ltp']))
+    if not frames:
+        return None
+    ticks = pd.concat(frames, ignore_index=True)
+    ticks['timestamp'] = pd.to_datetime(ticks['timestamp'], format='%Y-%m-%d %H:%M:%S')
+    return ticks.sort_values('timestamp').reset_index(drop=True)
+
+def market_expiry_dates(trades):
+    """Nearest market expiry on each trade day, as logged at entry"""
+    # The traded contract is never the nearest expiry (select_expiry skips it), so it can't be used here
+    if 'market_expiry' not in trades:
+        return pd.Series(pd.NaT, index=trades.index)
+    return pd.to_datetime(trades['market_expiry'], format='%d-%m-%Y', errors='coerce')
+
+def add_excursions(trades, ticks):
+    """Add MAE/MFE (in index points) for each trade from recorded ticks"""
+    times = ticks['timestamp'].values
+    prices = ticks['ltp'].values
+    starts = times.searchsorted(trades['entry_datetime'].values, side='left')
+    ends = times.searchsorted(trades['exit_datetime'].values, side='right')
+
+    mae = []
+    mfe = []
+    for start, end, entry_price, trade_type in zip(starts, ends, trades['entry_price'], trades['trade_type']):
+        if end <= start:
+            mae.append(float('nan'))
+            mfe.append(float('nan'))
+            continue
+        window = prices[start:end]
+        if trade_type == 'LONG':
+            mae.append(max(entry_price - window.min(), 0))
+            mfe.append(max(window.max() - entry_price, 0))
+        else:
+            mae.append(max(window.max() - entry_price, 0))
+            mfe.append(max(entry_price - window.min(), 0))
+
+    trades['mae'] = mae
+    trades['mfe'] = mfe
+    return trades
+
+def compute_analytics(trades, rolling_window=20):
+    """Compute P&L curves and breakdowns for the trade history"""
+    trades = trades.copy()
+    trades['win'] = trades['profit_absolute'] > 0
+    trades['cumulative_pnl'] = trades['profit_absolute'].cumsum()
+    trades['rolling_pnl'] = trades['profit_absolute'].rolling(rolling_window, min_periods=1).sum()
+    trades['cumulative_option_pnl'] = trades['option_profit'].fillna(0).cumsum()
+    trades['holding_minutes'] = (trades['exit_datetime'] - trades['entry_datetime']).dt.total_seconds() / 60
+    # Unknown for trades logged before the option leg was recorded
+    expiry = market_expiry_dates(trades)
+    same_day = trades['entry_datetime'].dt.normalize() == expiry
+    trades['expiry_day'] = same_day.map({True: 'yes', False: 'no'}).where(expiry.notna(), 'unknown')
+
+    aggregations = {
+        'trades': ('profit_absolute', 'size'),
+        'win_rate_pct': ('win', 'mean'),
+        'total_pnl': ('profit_absolute', 'sum'),
+        'avg_pnl': ('profit_absolute', 'mean'),
+        'total_option_pnl': ('option_profit', 'sum'),
+        'avg_holding_minutes': ('holding_minutes', 'mean'),
+    }
+    if 'mae' in trades:
+        aggregations['avg_mae'] = ('mae', 'mean')
+        aggregations['avg_mfe'] = ('mfe', 'mean')
+
+    breakdowns = {}
+    for name, keys in [
+        ('by_side', ['trade_type']),
+        ('by_exit_reason', ['exit_reason']),
+        ('by_side_and_exit_reason', ['trade_type', 'exit_reason']),
+        ('by_expiry_day', ['expiry_day']),
+    ]:
+        table = trades.groupby(keys).agg(**aggregations)
+        table['win_rate_pct'] = (table['win_rate_pct'] * 100).round(2)
+        breakdowns[name] = table.reset_index()
+
+    summary = {
+        'trades': len(trades),
+        'win_rate_pct': round(trades['win'].mean() * 100, 2),
+        'total_pnl': round(trades['profit_absolute'].sum(), 2),
+        'total_option_pnl': round(trades['option_profit'].sum(), 2),
+        'max_drawdown': round((trades['cumulative_pnl'].cummax().clip(lower=0) - trades['cumulative_pnl']).max(), 2),
+        'avg_holding_minutes': round(trades['holding_minutes'].mean(), 2),
+        'first_trade': trades['entry_datetime'].min().strftime('%Y-%m-%d'),
+        'last_trade': trades['exit_datetime'].max().strftime('%Y-%m-%d'),
+    }
+
+    return trades, summary, breakdowns
+
+def write_report(trades, summary, breakdowns, output_dir=REPORT_DIR):
+    """Write CSV files and a static HTML report, return the HTML path"""
+    os.makedirs(output_dir, exist_ok=True)
+
+    trades.to_csv(os.path.join(output_dir, 'trades.csv'), index=False)
+    for name, table in breakdowns.items():
+        table.to_csv(os.path.join(output_dir, f"{name}.csv"), index=False)
+
+    sections = [
+        "<h1>Trade Analytics Report</h1>",
+        f"<p>Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>",
+        "<h2>Summary</h2>",
+        pd.DataFrame([summary]).to_html(index=False),
+    ]
+    for name, table in breakdowns.items():
+        sections.append(f"<h2>{name.replace('_', ' ').title()}</h2>")
+        sections.append(table.to_html(index=False))
+    sections.append("<h2>Trades</h2>")
+    sections.append(trades.to_html(index=False))
+
+    html_path = os.path.join(output_dir, 'report.html')
+    with open(html_path, 'w') as f:
+        f.write("<html><head><meta charset='utf-8'><title>Trade Analytics</title></head><body>\n")
+        f.write("\n".join(sections))
+        f.write("\n</body></html>\n")
+    return html_path
+
+def generate_report(log_file=TRADE_LOG_FILE, ticks_dir=TICKS_DIR, output_dir=REPORT_DIR):
+    """Build the end-of-day analytics report from the full trade history"""
+    try:
+        if not os.path.exists(log_file):
+            logger.info("Trade log %s not found. Skipping report.", log_file)
+            return None
+
+        trades = load_trades(log_file)
+        if trades.empty:
+            logger.info("No trades logged yet. Skipping report.")
+            return None
+
+        ticks = load_ticks(ticks_dir, trades['entry_datetime'].dt.date) if ticks_dir else None
+        if ticks is not None:
+            trades = add_excursions(trades, ticks)
+
+        trades, summary, breakdowns = compute_analytics(trades)
+        html_path = write_report(trades, summary, breakdowns, output_dir)
+
+        logger.info("✓ Analytics report written to %s", html_path, extra={
+            'fields': {'report': html_path, **summary},
+            'console': "✓ Analytics report written to {report}\n"
+                       "  Trades: {trades} | Win Rate: {win_rate_pct}% | Total P&L: ₹{total_pnl}"
+        })
+        return html_path
+    except Exception as e:
+        logger.error("Error generating analytics report: %s", e)
+        return None
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate the trade analytics report")
+    parser.add_argument('--log', default=TRADE_LOG_FILE, help="Trade log written by log_trade")
+    parser.add_argument('--ticks', default=TICKS_DIR, help="Directory of daily tick CSVs for MAE/MFE")
+    parser.add_argument('--output', default=REPORT_DIR)
+    args = parser.parse_args()
+
+    setup_logging(log_file=None)
+    generate_report(args.log, args.ticks, args.output)
+
+if __name__ == "__main__":
+    main()
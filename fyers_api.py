@@ -1,5 +1,29 @@
 from fyers_apiv3 import fyersModel
 from datetime import datetime, timedelta
+import re
+from metrics import track_api_call
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Weekly option symbols encode Oct/Nov/Dec as O/N/D, e.g. NSE:NIFTY26O2025500CE
+MONTH_CODES = {month: str(month) for month in range(1, 10)}
+MONTH_CODES.update({10: 'O', 11: 'N', 12: 'D'})
+
+WEEKLY_OPTION_PATTERN = re.compile(r'^NSE:NIFTY(\d{2})([1-9OND])(\d{2})(\d+)(CE|PE)$')
+
+def weekly_option_symbol(expiry_date, strike, option_type):
+    """Build a Fyers weekly NIFTY option symbol"""
+    return f"NSE:NIFTY{expiry_date.strftime('%y')}{MONTH_CODES[expiry_date.month]}{expiry_date.strftime('%d')}{int(strike)}{option_type}"
+
+def parse_weekly_option_symbol(symbol):
+    """Return (expiry_date, strike, option_type) for a weekly option symbol, or None"""
+    match = WEEKLY_OPTION_PATTERN.match(symbol) if isinstance(symbol, str) else None
+    if not match:
+        return None
+    year, month_code, day, strike, option_type = match.groups()
+    month = {code: month for month, code in MONTH_CODES.items()}[month_code]
+    return datetime(2000 + int(year), month, int(day)), int(strike), option_type
 
 def initialize_fyers(client_id, access_token):
     """Initialize Fyers API client"""
@@ -10,6 +34,7 @@ def initialize_fyers(client_id, access_token):
         log_path=""
     )
 
+@track_api_call
 def get_previous_day_data(fyers, symbol):
     """Get previous day OHLC data"""
     try:
@@ -27,8 +52,7 @@ def get_previous_day_data(fyers, symbol):
         }
         
         response = fyers.history(data=data)
-        print("---historical data---")
-        print(response['candles'])
+        logger.debug("---historical data---\n%s", response.get('candles'))
         
         if response['s'] == 'ok' and len(response['candles']) >= 1:
             prev_candle = response['candles'][-1]  # Last complete day
@@ -40,12 +64,13 @@ def get_previous_day_data(fyers, symbol):
                 'prev_close': prev_candle[4]
             }
         else:
-            print(f"Error getting historical data: {response}")
+            logger.error("Error getting historical data: %s", response)
             return None
     except Exception as e:
-        print(f"Exception in get_previous_day_data: {e}")
+        logger.error("Exception in get_previous_day_data: %s", e)
         return None
 
+@track_api_call
 def get_today_open(fyers, symbol):
     """Get today's opening price from live quotes"""
     try:
@@ -56,12 +81,13 @@ def get_today_open(fyers, symbol):
             today_open = response['d'][0]['v']['open_price']
             return today_open
         else:
-            print(f"Error getting today's open: {response}")
+            logger.error("Error getting today's open: %s", response)
             return None
     except Exception as e:
-        print(f"Exception in get_today_open: {e}")
+        logger.error("Exception in get_today_open: %s", e)
         return None
 
+@track_api_call
 def get_ltp(fyers, symbol):
     """Get Last Traded Price"""
     try:
@@ -71,12 +97,13 @@ def get_ltp(fyers, symbol):
         if response['s'] == 'ok' and len(response['d']) > 0:
             return response['d'][0]['v']['lp']
         else:
-            print(f"Error getting LTP: {response}")
+            logger.error("Error getting LTP: %s", response)
             return None
     except Exception as e:
-        print(f"Exception in get_ltp: {e}")
+        logger.error("Exception in get_ltp: %s", e)
         return None
 
+@track_api_call
 def place_order(fyers, symbol, side, quantity):
     """Place market order - side should be 'BUY' or 'SELL'"""
     try:
@@ -94,12 +121,13 @@ def place_order(fyers, symbol, side, quantity):
         }
         
         response = fyers.place_order(data=data)
-        print(f"Order Response: {response}")
+        logger.info("Order Response: %s", response)
         return response
     except Exception as e:
-        print(f"Exception in place_order: {e}")
+        logger.error("Exception in place_order: %s", e)
         return None
     
+@track_api_call
 def get_option_chain_expiries(fyers):
     try:
         data = {
@@ -110,20 +138,21 @@ def get_option_chain_expiries(fyers):
         response = fyers.optionchain(data=data)
         return response['data']['expiryData']
     except Exception as e:
-        print(f"Exception in return option chain expiries {e}")
+        logger.error("Exception in return option chain expiries %s", e)
         return None
     
-def get_option_chain_expiry(fyers,expiry):
+@track_api_call
+def get_option_chain_expiry(fyers,expiry,strikecount=2):
     try:
         data = {
         "symbol":"NSE:NIFTY50-INDEX",
-        "strikecount":2,
+        "strikecount":strikecount,
         "timestamp": expiry
         }
         response = fyers.optionchain(data=data)
         return response['data']['optionsChain']
     except Exception as e:
-        print(f"Exception in return option chain for a given expiry {e}")
+        logger.error("Exception in return option chain for a given expiry %s", e)
         return None
     
 
@@ -0,0 +1,134 @@
+import argparse
+import logging
+import os
+import tempfile
+import time
+import numpy as np
+from logger import setup_logging, dropped_count
+from fyers_api import get_previous_day_data, get_today_open, get_ltp
+from strategy import check_trade_day_conditions
+from main import process_tick
+from simulator import SyntheticMarket, MockFyers, INDEX_SYMBOL, DAY_TYPES
+
+logger = logging.getLogger(__name__)
+
+def run_session(rate, duration, day_type='range', latency=0.0, burst_multiplier=10, burst_share=0.1, seed=None):
+    """Drive the tick path at a target rate and return latency statistics"""
+    # Size the path so the session consumes all of it and sees exactly burst_share of ticks in bursts
+    ticks_per_second = rate / ((1 - burst_share) + burst_share / burst_multiplier)
+    market = SyntheticMarket(day_type=day_type, ticks=int(ticks_per_second * duration) + 1,
+                             burst_share=burst_share, seed=seed)
+    fyers = MockFyers(market, latency=latency)
+
+    prev_data = get_previous_day_data(fyers, INDEX_SYMBOL)
+    prev_data['today_open'] = get_today_open(fyers, INDEX_SYMBOL)
+    # The load test keeps monitoring even on non-trade days
+    check_trade_day_conditions(prev_data)
+    prev_high = prev_data['prev_high']
+    prev_low = prev_data['prev_low']
+
+    trade_details = None
+    latencies = []
+    errors = 0
+    entries = 0
+    exits = 0
+    ticks = 0
+    start = time.perf_counter()
+    scheduled = start
+    end = start + duration
+
+    while scheduled < end and market.advance():
+        # Open-loop schedule: late ticks are not skipped, so queueing shows up as latency
+        scheduled += 1 / (rate * burst_multiplier if market.in_burst() else rate)
+        now = time.perf_counter()
+        if scheduled > now:
+            time.sleep(scheduled - now)
+
+        try:
+            ltp = get_ltp(fyers, INDEX_SYMBOL)
+            if ltp is None:
+                errors += 1
+                continue
+            was_open = trade_details is not None
+            trade_details = process_tick(fyers, INDEX_SYMBOL, 100000, 1, ltp, prev_high, prev_low, trade_details)
+            if not was_open and trade_details is not None:
+                entries += 1
+            elif was_open and trade_details is None:
+                exits += 1
+        except Exception as e:
+            logger.error("Error in tick path: %s", e)
+            errors += 1
+        latencies.append(time.perf_counter() - scheduled)
+        ticks += 1
+
+    elapsed = time.perf_counter() - start
+    latencies = np.array(latencies) * 1000 if latencies else np.zeros(1)
+    return {
+        'target_rate': rate,
+        # Offered rate includes bursts, so compare it rather than the base rate
+        'offered_rate': round(ticks / max(scheduled - start, 1e-9), 1),
+        'achieved_rate': round(ticks / elapsed, 1),
+        'ticks': ticks,
+        'errors': errors,
+        'entries': entries,
+        'exits': exits,
+        'p50_ms': round(float(np.percentile(latencies, 50)), 3),
+        'p99_ms': round(float(np.percentile(latencies, 99)), 3),
+        'max_ms': round(float(latencies.max()), 3),
+    }
+
+def find_saturation(start_rate=100, max_rate=50000, duration=5.0, day_type='range', latency=0.0,
+                    burst_multiplier=10, burst_share=0.1, seed=None, tolerance=0.95):
+    """Double the base tick rate until the tick path can no longer keep up"""
+    results = []
+    rate = start_rate
+    saturated = None
+    while rate <= max_rate:
+        result = run_session(rate, duration, day_type, latency, burst_multiplier, burst_share, seed)
+        results.append(result)
+        logger.warning("Base %s/s -> offered %s/s | achieved %s/s | p50 %sms | p99 %sms | max %sms | "
+                       "entries %s | exits %s | errors %s",
+                       result['target_rate'], result['offered_rate'], result['achieved_rate'], result['p50_ms'],
+                       result['p99_ms'], result['max_ms'], result['entries'], result['exits'], result['errors'])
+        if result['achieved_rate'] < result['offered_rate'] * tolerance:
+            saturated = result
+            break
+        rate *= 2
+
+    if saturated:
+        logger.warning("✓ Tick path saturates at ~%s ticks/s achieved (offered %s ticks/s)",
+                       saturated['achieved_rate'], saturated['offered_rate'])
+    else:
+        logger.warning("✓ No saturation up to %s ticks/s offered", results[-1]['offered_rate'] if results else 0)
+    return results, saturated
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the strategy tick path against a synthetic market")
+    parser.add_argument('--day-type', choices=DAY_TYPES, default='range')
+    parser.add_argument('--start-rate', type=int, default=100)
+    parser.add_argument('--max-rate', type=int, default=50000)
+    parser.add_argument('--duration', type=float, default=5.0, help="Seconds per rate step")
+    parser.add_argument('--latency', type=float, default=0.0, help="Simulated API latency in seconds")
+    parser.add_argument('--burst-multiplier', type=int, default=10)
+    parser.add_argument('--burst-share', type=float, default=0.1, help="Fraction of ticks that arrive in bursts")
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--log-level', default='WARNING')
+    args = parser.parse_args()
+
+    setup_logging(args.log_level, log_file=None)
+
+    # Keep the synthetic trades out of the real trade_log.txt
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        try:
+            find_saturation(args.start_rate, args.max_rate, args.duration, args.day_type,
+                            args.latency, args.burst_multiplier, args.burst_share, args.seed)
+        finally:
+            os.chdir(cwd)
+
+    if dropped_count():
+        logger.warning("Log records dropped during the run: %s", dropped_count())
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+import atexit
+import json
+import logging
+import queue
+import sys
+import threading
+from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+LOG_FILE = 'strategy.log'
+QUEUE_SIZE = 10000
+# Slots only WARNING+ and keep records may use, so a flood of INFO can't crowd them out
+RESERVED_SLOTS = 1000
+# How long such a record may block the caller when even the reserve is full
+PRIORITY_TIMEOUT = 0.5
+
+RULE = "=" * 60
+
+_listener = None
+
+# Records may carry these via extra=:
+#   fields  - dict emitted as JSON keys and available to the console template
+#   console - str.format template used instead of the message on the console
+#   banner  - wrap the message in horizontal rules on the console
+#   keep    - never drop the record when the queue is full, as for WARNING and above
+class ConsoleFormatter(logging.Formatter):
+    """Render the human-readable banners and blocks for the terminal"""
+
+    def format(self, record):
+        console = getattr(record, 'console', None)
+        if console:
+            message = console.format_map({'rule': RULE, **getattr(record, 'fields', {})})
+        else:
+            message = record.getMessage()
+        if getattr(record, 'banner', False):
+            message = f"\n{RULE}\n{message}\n{RULE}"
+        if record.exc_info:
+            message += "\n" + self.formatException(record.exc_info)
+        return message
+
+class JsonFormatter(logging.Formatter):
+    """Format records as one JSON object per line"""
+
+    def format(self, record):
+        entry = {
+            'time': datetime.fromtimestamp(record.created).strftime('%Y-%m-%d %H:%M:%S.%f')[:-3],
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        entry.update(getattr(record, 'fields', {}))
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+class DroppingQueueHandler(QueueHandler):
+    """Enqueue records without formatting, dropping routine records when the queue is full"""
+
+    def __init__(self, log_queue, reserved=RESERVED_SLOTS):
+        super().__init__(log_queue)
+        self.limit = log_queue.maxsize - reserved
+        self.dropped = 0
+        self._dropped_lock = threading.Lock()
+
+    def prepare(self, record):
+        # Formatting happens on the worker thread, not the trading thread
+        return record
+
+    def enqueue(self, record):
+        try:
+            if record.levelno >= logging.WARNING or getattr(record, 'keep', False):
+                self.queue.put(record, timeout=PRIORITY_TIMEOUT)
+            elif self.queue.qsize() < self.limit:
+                self.queue.put_nowait(record)
+            else:
+                raise queue.Full
+        except queue.Full:
+            with self._dropped_lock:
+                self.dropped += 1
+
+def setup_logging(level='INFO', json_output=True, log_file=LOG_FILE,
+                  max_bytes=10 * 1024 * 1024, backup_count=5, queue_size=QUEUE_SIZE):
+    """Route all loggers through a bounded queue drained by a background worker"""
+    global _listener
+    if _listener is not None:
+        return _listener
+
+    console = logging.StreamHandler(sys.stdout)
+    console.setFormatter(ConsoleFormatter())
+    handlers = [console]
+
+    if log_file:
+        file_handler = RotatingFileHandler(log_file, maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8')
+        if json_output:
+            file_handler.setFormatter(JsonFormatter())
+        else:
+            file_handler.setFormatter(logging.Formatter('%(asctime)s %(levelname)s %(name)s: %(message)s'))
+        handlers.append(file_handler)
+
+    log_queue = queue.Queue(maxsize=queue_size + RESERVED_SLOTS)
+    root = logging.getLogger()
+    root.handlers = [DroppingQueueHandler(log_queue)]
+    root.setLevel(level)
+
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+    return _listener
+
+def shutdown_logging():
+    """Flush queued records and stop the background worker"""
+    global _listener
+    if _listener is None:
+        return
+    _listener.stop()
+    _listener = None
+
+def dropped_count():
+    """Number of records dropped because the queue was full"""
+    for handler in logging.getLogger().handlers:
+        if isinstance(handler, DroppingQueueHandler):
+            return handler.dropped
+    return 0
@@ -1,19 +1,27 @@
 import time
 from datetime import datetime, time as dt_time
 import pytz
+import logging
 from config import load_config
-from fyers_api import initialize_fyers, get_previous_day_data, get_today_open, get_ltp
+from analytics import generate_report, open_tick_recorder
+from metrics import start_metrics_server, inc_counter, set_gauge, observe
+from logger import setup_logging, dropped_count
+from option_archive import start_option_archiver
+from fyers_api import initialize_fyers, get_previous_day_data, get_today_open, get_ltp, get_option_chain_expiries
 from strategy import (
     check_trade_day_conditions, 
     check_entry_signal, 
     enter_trade,
     check_exit_signal,
-    exit_trade
+    exit_trade,
+    select_expiry
 )
 
 # Indian timezone
 IST = pytz.timezone('Asia/Kolkata')
 
+logger = logging.getLogger(__name__)
+
 def get_ist_time():
     """Get current time in IST"""
     return datetime.now(IST)
@@ -31,28 +39,78 @@ def is_market_closed():
     now = get_ist_time().time()
     return now >= dt_time(15, 15, 0)
 
+def process_tick(fyers, symbol, capital, risk_pct, ltp, prev_high, prev_low, trade_details):
+    """Run entry/exit logic for one LTP update and return the open trade (or None)"""
+    set_gauge('strategy_ltp', ltp)
+    set_gauge('strategy_distance_to_prev_high', prev_high - ltp)
+    set_gauge('strategy_distance_to_prev_low', ltp - prev_low)
+    
+    # If no trade taken yet, check for entry
+    if trade_details is None:
+        signal = check_entry_signal(ltp, prev_high, prev_low)
+        
+        if signal:
+            trade_details = enter_trade(fyers, symbol, capital, risk_pct, signal, ltp, prev_high, prev_low)
+            
+            if trade_details:
+                inc_counter('strategy_trades_entered_total', labels={'side': signal})
+            else:
+                logger.warning("Entry failed, continuing to monitor...")
+    
+    # If trade is active, check for exit
+    else:
+        if trade_details['type'] == 'LONG':
+            mtm = (ltp - trade_details['entry_price']) * trade_details['quantity']
+        else:
+            mtm = (trade_details['entry_price'] - ltp) * trade_details['quantity']
+        set_gauge('strategy_position_mtm', mtm)
+        
+        # Check stop loss
+        if check_exit_signal(ltp, trade_details['type'], prev_high, prev_low):
+            
+            success = exit_trade(fyers, symbol, trade_details, ltp, "Stop Loss Hit")
+            if success:
+                trade_details = None  # Mark position as closed
+                logger.info("Trade completed. Monitoring for next signal...")
+            else:
+                logger.warning("Exit failed, retrying...")
+        # Don't print every second - only print every 10 seconds or on significant price moves
+        # Removed the else block to reduce console spam
+    
+    set_gauge('strategy_position_open', 0 if trade_details is None else 1)
+    if trade_details is None:
+        set_gauge('strategy_position_mtm', 0)
+    
+    return trade_details
+
 def main():
-    print("="*60)
-    print("Fyers Live Trading Strategy")
-    print("="*60)
+    setup_logging()
+    
+    logger.info("Fyers Live Trading Strategy", extra={'banner': True})
     
     # Show current time in both local and IST
     local_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S %Z')
     ist_time = get_ist_time().strftime('%Y-%m-%d %H:%M:%S %Z')
-    print(f"\nLocal Time: {local_time}")
-    print(f"IST Time: {ist_time}")
+    logger.info("Start time", extra={
+        'fields': {'local_time': local_time, 'ist_time': ist_time},
+        'console': "\nLocal Time: {local_time}\nIST Time: {ist_time}"
+    })
     
     # Load configuration
     config = load_config()
     
     if not config:
-        print("Failed to load configuration. Please check config.json")
+        logger.error("Failed to load configuration. Please check config.json")
         return
     
     if config['client_id'] == "YOUR_CLIENT_ID" or config['access_token'] == "YOUR_ACCESS_TOKEN":
-        print("\n⚠️  Please update config.json with your Fyers credentials!")
+        logger.warning("⚠️  Please update config.json with your Fyers credentials!",
+                       extra={'console': "\n⚠️  Please update config.json with your Fyers credentials!"})
         return
     
+    # Serve live metrics for monitoring
+    start_metrics_server(config.get('metrics_port', 8000))
+    
     # Initialize Fyers API
     fyers = initialize_fyers(config['client_id'], config['access_token'])
     
@@ -60,31 +118,32 @@ def main():
     capital = config['capital']
     risk_pct = config['risk_per_trade_pct']
     
-    print(f"\nTrading Symbol: {symbol}")
-    print(f"Capital: ₹{capital}")
-    print(f"Risk Per Trade: {risk_pct}%")
-    print(f"\nWaiting for 9:15 AM IST...\n")
+    logger.info("Strategy settings", extra={
+        'fields': {'symbol': symbol, 'capital': capital, 'risk_pct': risk_pct},
+        'console': "\nTrading Symbol: {symbol}\nCapital: ₹{capital}\nRisk Per Trade: {risk_pct}%"
+    })
+    logger.info("Waiting for 9:15 AM IST...", extra={'console': "\nWaiting for 9:15 AM IST...\n"})
     
     # Wait until 9:15 AM IST
     wait_until_time(dt_time(9, 15, 0))
-    print(f"✓ Market opened at 9:15 AM IST (Local: {datetime.now().strftime('%H:%M:%S')})")
+    logger.info("✓ Market opened at 9:15 AM IST (Local: %s)", datetime.now().strftime('%H:%M:%S'))
     
     # Wait 1 minute until 9:16:01 IST
-    print("Waiting for 9:16:01 IST...")
+    logger.info("Waiting for 9:16:01 IST...")
     wait_until_time(dt_time(9, 16, 1))
     
     # Get previous day data
     prev_data = get_previous_day_data(fyers, symbol)
     
     if not prev_data:
-        print("Failed to get previous day data. Exiting.")
+        logger.error("Failed to get previous day data. Exiting.")
         return
     
     # Get today's opening price from live quotes
     today_open = get_today_open(fyers, symbol)
     
     if not today_open:
-        print("Failed to get today's opening price. Exiting.")
+        logger.error("Failed to get today's opening price. Exiting.")
         return
     
     # Add today's open to prev_data
@@ -94,31 +153,45 @@ def main():
     is_trade_day = check_trade_day_conditions(prev_data)
     
     if not is_trade_day:
-        print("Today is NOT a trade day. Exiting strategy.")
+        logger.info("Today is NOT a trade day. Exiting strategy.")
         return
     
+    # Snapshot the option chain through the session for premium-accurate backtests
+    archive_stop = archive_thread = None
+    expiries = get_option_chain_expiries(fyers)
+    selected_expiry = select_expiry(expiries) if expiries else None
+    if selected_expiry:
+        archive_stop, archive_thread = start_option_archiver(
+            fyers, selected_expiry['expiry'], selected_expiry['date'],
+            config.get('option_archive_interval', 60)
+        )
+    
     # Trade day - start monitoring
-    print("Starting live monitoring every 1 second...")
+    logger.info("Starting live monitoring every 1 second...")
     
     prev_high = prev_data['prev_high']
     prev_low = prev_data['prev_low']
     
+    # Ticks feed MAE/MFE in the end-of-day report
+    tick_file = open_tick_recorder(date=get_ist_time())
+    
     trade_taken = False
     trade_details = None
     #trade_completed = False  # New flag to track if any trade was completed today
-    last_print_time = 0  # Track last print time to avoid spam
     
     while not is_market_closed():
         try:
+            loop_start = time.perf_counter()
+            
             # Get current LTP
             ltp = get_ltp(fyers, symbol)
             
             if ltp is None:
-                print("Failed to get LTP, retrying...")
+                logger.warning("Failed to get LTP, retrying...")
                 time.sleep(1)
                 continue
             
-            current_time = get_ist_time().strftime('%H:%M:%S')
+            tick_file.write(f"{get_ist_time().strftime('%Y-%m-%d %H:%M:%S')},{ltp}\n")
             
             # If a trade was already completed today, just monitor until market close
             #if trade_completed:
@@ -130,69 +203,55 @@ def main():
             #    time.sleep(1)
             #    continue
             
-            # If no trade taken yet, check for entry
-            if not trade_taken:
-                signal = check_entry_signal(ltp, prev_high, prev_low)
-                
-                if signal:
-                    trade_details = enter_trade(fyers, symbol, capital, risk_pct, signal, ltp, prev_high, prev_low)
-                    
-                    if trade_details:
-                        trade_taken = True
-                    else:
-                        print("Entry failed, continuing to monitor...")
-                else:
-                    # Print only every 30 seconds to avoid spam
-                    """
-                    current_timestamp = time.time()
-                    if current_timestamp - last_print_time >= 30:
-                        print(f"[{current_time}] LTP: ₹{ltp} | Prev High: ₹{prev_high} | Prev Low: ₹{prev_low} | Waiting for breakout...")
-                        last_print_time = current_timestamp
-                    """
-                    pass
+            trade_details = process_tick(fyers, symbol, capital, risk_pct, ltp, prev_high, prev_low, trade_details)
+            trade_taken = trade_details is not None
             
-            # If trade is active, check for exit
-            else:
-                # Check stop loss
-                if check_exit_signal(ltp, trade_details['type'], prev_high, prev_low):
-                    
-                    success = exit_trade(fyers, symbol, trade_details, ltp, "Stop Loss Hit")
-                    if success:
-                        trade_taken = False  # Mark position as closed
-                        trade_details = None
-                        print("Trade completed. Monitoring for next signal...")
-                    else:
-                        print("Exit failed, retrying...")
-                # Don't print every second - only print every 10 seconds or on significant price moves
-                # Removed the else block to reduce console spam
+            set_gauge('logging_dropped_records', dropped_count())
+            observe('strategy_loop_seconds', time.perf_counter() - loop_start)
             
             # Sleep for 1 second
             time.sleep(1)
             
         except KeyboardInterrupt:
-            print("\n\nStrategy interrupted by user")
+            logger.info("Strategy interrupted by user", extra={'console': "\n\nStrategy interrupted by user"})
             if trade_taken and trade_details:
-                print("Attempting to exit open position...")
+                logger.info("Attempting to exit open position...")
                 ltp = get_ltp(fyers, symbol)
                 if ltp:
                     exit_trade(fyers, symbol, trade_details, ltp, "Manual Exit")
+            if archive_stop:
+                archive_stop.set()
+                archive_thread.join()
+            tick_file.close()
             return
         except Exception as e:
-            print(f"Error in main loop: {e}")
+            logger.error("Error in main loop: %s", e)
+            inc_counter('strategy_loop_errors_total')
             time.sleep(1)
     
     # Market closed at 3:15 PM IST
     if trade_details is not None:  # Check if position still exists
-        print(f"\n⏰ Market closing at 3:15 PM IST (Local: {datetime.now().strftime('%H:%M:%S')}) - Open position detected")
+        logger.info("⏰ Market closing at 3:15 PM IST - Open position detected", extra={
+            'fields': {'local_time': datetime.now().strftime('%H:%M:%S')},
+            'console': "\n⏰ Market closing at 3:15 PM IST (Local: {local_time}) - Open position detected"
+        })
         ltp = get_ltp(fyers, symbol)
         if ltp:
             exit_trade(fyers, symbol, trade_details, ltp, "Market Close - 3:15 PM")
     else:
-        print(f"\n⏰ Market closed at 3:15 PM IST (Local: {datetime.now().strftime('%H:%M:%S')}) - No open positions")
+        logger.info("⏰ Market closed at 3:15 PM IST - No open positions", extra={
+            'fields': {'local_time': datetime.now().strftime('%H:%M:%S')},
+            'console': "\n⏰ Market closed at 3:15 PM IST (Local: {local_time}) - No open positions"
+        })
+    
+    if archive_stop:
+        archive_stop.set()
+        archive_thread.join()
+    tick_file.close()
+    
+    logger.info("Strategy completed for the day", extra={'banner': True})
     
-    print("\n" + "="*60)
-    print("Strategy completed for the day")
-    print("="*60)
+    generate_report()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
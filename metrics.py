@@ -0,0 +1,153 @@
+import logging
+import threading
+import time
+from functools import wraps
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+_lock = threading.Lock()
+_counters = {}
+_gauges = {}
+_histograms = {}
+_help = {}
+
+def _key(name, labels):
+    return (name, tuple(sorted(labels.items())) if labels else ())
+
+def _format_labels(labels, extra=None):
+    items = list(labels)
+    if extra:
+        items.append(extra)
+    if not items:
+        return ""
+    return "{" + ",".join(f'{k}="{v}"' for k, v in items) + "}"
+
+def describe(name, help_text):
+    """Set the HELP text shown for a metric"""
+    _help[name] = help_text
+
+def inc_counter(name, value=1, labels=None):
+    """Increment a counter"""
+    key = _key(name, labels)
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + value
+
+def set_gauge(name, value, labels=None):
+    """Set a gauge to the given value"""
+    key = _key(name, labels)
+    with _lock:
+        _gauges[key] = value
+
+def observe(name, value, labels=None, buckets=DEFAULT_BUCKETS):
+    """Record an observation in a histogram"""
+    key = _key(name, labels)
+    with _lock:
+        hist = _histograms.get(key)
+        if hist is None:
+            hist = {'buckets': buckets, 'counts': [0] * len(buckets), 'sum': 0.0, 'count': 0}
+            _histograms[key] = hist
+        for i, bound in enumerate(hist['buckets']):
+            if value <= bound:
+                hist['counts'][i] += 1
+        hist['sum'] += value
+        hist['count'] += 1
+
+def track_api_call(func):
+    """Decorator recording latency and error count of a Fyers API helper"""
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        labels = {'call': func.__name__}
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        observe('fyers_api_call_seconds', time.perf_counter() - start, labels)
+        inc_counter('fyers_api_calls_total', labels=labels)
+        # API helpers return None when the call failed
+        if result is None:
+            inc_counter('fyers_api_errors_total', labels=labels)
+        return result
+    return wrapper
+
+def render():
+    """Render all metrics in Prometheus text exposition format"""
+    with _lock:
+        counters = dict(_counters)
+        gauges = dict(_gauges)
+        histograms = {k: {**v, 'counts': list(v['counts'])} for k, v in _histograms.items()}
+
+    lines = []
+    seen = set()
+
+    def header(name, metric_type):
+        if name in seen:
+            return
+        seen.add(name)
+        if name in _help:
+            lines.append(f"# HELP {name} {_help[name]}")
+        lines.append(f"# TYPE {name} {metric_type}")
+
+    for (name, labels), value in sorted(counters.items()):
+        header(name, 'counter')
+        lines.append(f"{name}{_format_labels(labels)} {value}")
+
+    for (name, labels), value in sorted(gauges.items()):
+        header(name, 'gauge')
+        lines.append(f"{name}{_format_labels(labels)} {value}")
+
+    for (name, labels), hist in sorted(histograms.items()):
+        header(name, 'histogram')
+        for bound, count in zip(hist['buckets'], hist['counts']):
+            lines.append(f"{name}_bucket{_format_labels(labels, ('le', bound))} {count}")
+        lines.append(f"{name}_bucket{_format_labels(labels, ('le', '+Inf'))} {hist['count']}")
+        lines.append(f"{name}_sum{_format_labels(labels)} {hist['sum']}")
+        lines.append(f"{name}_count{_format_labels(labels)} {hist['count']}")
+
+    return "\n".join(lines) + "\n"
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    """Serve /metrics in Prometheus text format"""
+
+    def do_GET(self):
+        if self.path != '/metrics':
+            self.send_response(404)
+            self.end_headers()
+            return
+        body = render().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Keep scrapes out of the strategy console
+        pass
+
+def start_metrics_server(port=8000, host='127.0.0.1'):
+    """Start the metrics endpoint on a daemon thread"""
+    try:
+        server = ThreadingHTTPServer((host, port), MetricsHandler)
+        server.daemon_threads = True
+        thread = threading.Thread(target=server.serve_forever, name='metrics-server', daemon=True)
+        thread.start()
+        logger.info("✓ Metrics served at http://%s:%s/metrics", host, port)
+        return server
+    except Exception as e:
+        logger.error("Error starting metrics server: %s", e)
+        return None
+
+describe('fyers_api_call_seconds', 'Latency of Fyers API helper calls')
+describe('fyers_api_calls_total', 'Fyers API helper calls')
+describe('fyers_api_errors_total', 'Fyers API helper calls that failed')
+describe('strategy_ltp', 'Last traded price of the index')
+describe('strategy_distance_to_prev_high', 'Previous day high minus LTP')
+describe('strategy_distance_to_prev_low', 'LTP minus previous day low')
+describe('strategy_position_open', '1 if a position is open')
+describe('strategy_position_mtm', 'Mark-to-market of the open index position')
+describe('strategy_loop_seconds', 'Duration of one monitoring loop iteration')
+describe('strategy_loop_errors_total', 'Exceptions raised in the monitoring loop')
+describe('strategy_trades_entered_total', 'Trades entered')
+describe('strategy_trades_exited_total', 'Trades exited')
+describe('logging_dropped_records', 'Log records dropped because the logging queue was full')
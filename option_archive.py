@@ -0,0 +1,203 @@
+import json
+import logging
+import os
+import threading
+from datetime import datetime
+import numpy as np
+import pytz
+from fyers_api import get_option_chain_expiry
+
+IST = pytz.timezone('Asia/Kolkata')
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_DIR = 'option_archive'
+
+# One append-only binary file per column in every date/expiry/strike partition
+COLUMNS = {
+    'timestamp': np.dtype('<i8'),  # epoch milliseconds
+    'ltp': np.dtype('<f8'),
+    'bid': np.dtype('<f8'),
+    'ask': np.dtype('<f8'),
+    'oi': np.dtype('<f8'),
+    'volume': np.dtype('<f8'),
+    'spot': np.dtype('<f8'),
+}
+
+def _date_key(value):
+    """Normalise a date/datetime/'dd-mm-YYYY' string to 'YYYY-MM-DD'"""
+    if isinstance(value, str):
+        try:
+            return datetime.strptime(value, '%Y-%m-%d').strftime('%Y-%m-%d')
+        except ValueError:
+            return datetime.strptime(value, '%d-%m-%Y').strftime('%Y-%m-%d')
+    return value.strftime('%Y-%m-%d')
+
+def _to_millis(timestamp):
+    if isinstance(timestamp, datetime):
+        if timestamp.tzinfo is None:
+            timestamp = IST.localize(timestamp)
+        return int(timestamp.timestamp() * 1000)
+    return int(timestamp)
+
+def partition_path(base_dir, date, expiry, strike, option_type):
+    return os.path.join(base_dir, _date_key(date), _date_key(expiry), f"{int(strike)}{option_type}")
+
+class OptionChainArchiver:
+    """Buffer option chain snapshots and append them to the columnar archive"""
+
+    def __init__(self, base_dir=ARCHIVE_DIR, flush_every=10):
+        self.base_dir = base_dir
+        self.flush_every = flush_every
+        self.pending = {}
+        self.snapshots = 0
+        self.known_partitions = set()
+
+    def snapshot(self, option_chain, expiry, timestamp=None):
+        """Add one option chain response (list of rows) taken at timestamp"""
+        if timestamp is None:
+            timestamp = datetime.now(IST)
+        millis = _to_millis(timestamp)
+        date = datetime.fromtimestamp(millis / 1000, IST)
+
+        spot = float('nan')
+        for row in option_chain:
+            if not row.get('option_type'):
+                spot = row.get('ltp', spot)
+
+        for row in option_chain:
+            option_type = row.get('option_type')
+            if option_type not in ('CE', 'PE'):
+                continue
+            path = partition_path(self.base_dir, date, expiry, row['strike_price'], option_type)
+            columns = self.pending.setdefault(path, {'symbol': row.get('symbol'), 'rows': []})
+            columns['rows'].append((
+                millis,
+                row.get('ltp', float('nan')),
+                row.get('bid', float('nan')),
+                row.get('ask', float('nan')),
+                row.get('oi', float('nan')),
+                row.get('volume', float('nan')),
+                spot,
+            ))
+
+        self.snapshots += 1
+        if self.snapshots % self.flush_every == 0:
+            self.flush()
+
+    def flush(self):
+        """Append buffered rows to their partition files"""
+        pending, self.pending = self.pending, {}
+        for path, columns in pending.items():
+            if path not in self.known_partitions:
+                os.makedirs(path, exist_ok=True)
+                meta_file = os.path.join(path, 'meta.json')
+                if not os.path.exists(meta_file):
+                    with open(meta_file, 'w') as f:
+                        json.dump({'symbol': columns['symbol'], 'columns': {k: v.str for k, v in COLUMNS.items()}}, f)
+                self.known_partitions.add(path)
+
+            rows = columns['rows']
+            for i, (name, dtype) in enumerate(COLUMNS.items()):
+                values = np.array([row[i] if row[i] is not None else np.nan for row in rows], dtype=dtype)
+                with open(os.path.join(path, name), 'ab') as f:
+                    values.tofile(f)
+
+class OptionChainArchive:
+    """Read archived option chain snapshots straight from the column files"""
+
+    def __init__(self, base_dir=ARCHIVE_DIR):
+        self.base_dir = base_dir
+
+    def dates(self):
+        if not os.path.isdir(self.base_dir):
+            return []
+        return sorted(os.listdir(self.base_dir))
+
+    def expiries(self, date):
+        path = os.path.join(self.base_dir, _date_key(date))
+        return sorted(os.listdir(path)) if os.path.isdir(path) else []
+
+    def strikes(self, date, expiry):
+        """Return sorted (strike, option_type) pairs archived for a date/expiry"""
+        path = os.path.join(self.base_dir, _date_key(date), _date_key(expiry))
+        if not os.path.isdir(path):
+            return []
+        return sorted((int(name[:-2]), name[-2:]) for name in os.listdir(path))
+
+    def symbol(self, date, expiry, strike, option_type):
+        meta_file = os.path.join(partition_path(self.base_dir, date, expiry, strike, option_type), 'meta.json')
+        with open(meta_file, 'r') as f:
+            return json.load(f)['symbol']
+
+    def _length(self, path):
+        # All columns are appended together, but a flush in progress may leave one short
+        # or end in a partial value
+        return min(os.path.getsize(os.path.join(path, name)) // dtype.itemsize for name, dtype in COLUMNS.items())
+
+    def _read(self, path, name, start, stop):
+        """Read rows [start, stop) of one column without keeping the file open"""
+        dtype = COLUMNS[name]
+        if stop <= start:
+            return np.empty(0, dtype=dtype)
+        return np.fromfile(os.path.join(path, name), dtype=dtype, count=stop - start, offset=start * dtype.itemsize)
+
+    def series(self, date, expiry, strike, option_type, start=None, end=None):
+        """Return column arrays for one contract between start and end (inclusive)"""
+        path = partition_path(self.base_dir, date, expiry, strike, option_type)
+        if not os.path.isdir(path):
+            return None
+        length = self._length(path)
+        timestamps = self._read(path, 'timestamp', 0, length)
+        lo = 0 if start is None else int(timestamps.searchsorted(_to_millis(start), side='left'))
+        hi = length if end is None else int(timestamps.searchsorted(_to_millis(end), side='right'))
+        # Only the matching rows of the other columns are read
+        return {name: timestamps[lo:hi] if name == 'timestamp' else self._read(path, name, lo, hi)
+                for name in COLUMNS}
+
+    def quote(self, date, expiry, strike, option_type, timestamp):
+        """Return the last snapshot of a contract at or before timestamp"""
+        path = partition_path(self.base_dir, date, expiry, strike, option_type)
+        if not os.path.isdir(path):
+            return None
+        timestamps = self._read(path, 'timestamp', 0, self._length(path))
+        index = int(timestamps.searchsorted(_to_millis(timestamp), side='right')) - 1
+        if index < 0:
+            return None
+        quote = {name: self._read(path, name, index, index + 1)[0].item() for name in COLUMNS}
+        quote['strike_price'] = int(strike)
+        quote['option_type'] = option_type
+        return quote
+
+    def chain_at(self, date, expiry, timestamp):
+        """Return the archived chain for a date/expiry as of timestamp"""
+        chain = []
+        for strike, option_type in self.strikes(date, expiry):
+            quote = self.quote(date, expiry, strike, option_type, timestamp)
+            if quote:
+                chain.append(quote)
+        return chain
+
+def start_option_archiver(fyers, expiry, expiry_date, interval=60, strikecount=10, base_dir=ARCHIVE_DIR):
+    """Snapshot the option chain every interval seconds on a daemon thread"""
+    # At this cadence each snapshot is written straight away, so an abrupt exit loses nothing
+    archiver = OptionChainArchiver(base_dir, flush_every=1)
+    stop = threading.Event()
+
+    def run():
+        try:
+            while not stop.is_set():
+                try:
+                    option_chain = get_option_chain_expiry(fyers, expiry, strikecount)
+                    if option_chain:
+                        archiver.snapshot(option_chain, expiry_date)
+                except Exception as e:
+                    logger.error("Error archiving option chain: %s", e)
+                stop.wait(interval)
+        finally:
+            archiver.flush()
+
+    thread = threading.Thread(target=run, name='option-archiver', daemon=True)
+    thread.start()
+    logger.info("✓ Archiving option chain for expiry %s every %ss", _date_key(expiry_date), interval)
+    return stop, thread
@@ -0,0 +1,177 @@
+import math
+import time
+from datetime import datetime, timedelta
+import numpy as np
+import pytz
+from fyers_api import weekly_option_symbol, parse_weekly_option_symbol
+
+IST = pytz.timezone('Asia/Kolkata')
+
+INDEX_SYMBOL = "NSE:NIFTY50-INDEX"
+STRIKE_INTERVAL = 50
+RISK_FREE_RATE = 0.065
+DAY_TYPES = ('trend_up', 'trend_down', 'range', 'gap_up', 'gap_down')
+
+def norm_cdf(x):
+    return 0.5 * (1 + math.erf(x / math.sqrt(2)))
+
+def option_price(spot, strike, days_to_expiry, iv, option_type):
+    """Black-Scholes premium for a NIFTY option"""
+    t = max(days_to_expiry, 0.25) / 365
+    d1 = (math.log(spot / strike) + (RISK_FREE_RATE + iv * iv / 2) * t) / (iv * math.sqrt(t))
+    d2 = d1 - iv * math.sqrt(t)
+    if option_type == 'CE':
+        return spot * norm_cdf(d1) - strike * math.exp(-RISK_FREE_RATE * t) * norm_cdf(d2)
+    return strike * math.exp(-RISK_FREE_RATE * t) * norm_cdf(-d2) - spot * norm_cdf(-d1)
+
+class SyntheticMarket:
+    """Generate a previous-day candle and an intraday NIFTY tick path"""
+
+    def __init__(self, day_type='range', prev_close=25000.0, ticks=22500, iv=0.13, seed=None,
+                 burst_share=0.1, burst_count=5):
+        if day_type not in DAY_TYPES:
+            raise ValueError(f"day_type must be one of {DAY_TYPES}")
+        self.day_type = day_type
+        self.iv = iv
+        self.rng = np.random.default_rng(seed)
+        self.today = datetime.now(IST).replace(hour=0, minute=0, second=0, microsecond=0)
+        self.prev_candle = self._previous_day(prev_close)
+        self.path = self._intraday_path(ticks)
+        self.bursts = self._burst_mask(ticks, burst_share, burst_count)
+        self.index = 0
+        self.expiries = self._expiries()
+
+    def _previous_day(self, prev_close):
+        # Small-bodied day so the trade day conditions can pass
+        prev_open = prev_close * (1 + self.rng.normal(0, 0.002))
+        prev_high = max(prev_open, prev_close) * (1 + abs(self.rng.normal(0.004, 0.002)))
+        prev_low = min(prev_open, prev_close) * (1 - abs(self.rng.normal(0.004, 0.002)))
+        timestamp = int((self.today - timedelta(days=1)).timestamp())
+        return [timestamp, round(prev_open, 2), round(prev_high, 2), round(prev_low, 2), round(prev_close, 2), 0]
+
+    def _intraday_path(self, ticks):
+        prev_open, prev_high, prev_low, prev_close = self.prev_candle[1:5]
+        gap = {'gap_up': 0.006, 'gap_down': -0.006}.get(self.day_type, self.rng.normal(0, 0.001))
+        open_price = prev_close * (1 + gap)
+
+        drift = {'trend_up': 0.008, 'trend_down': -0.008}.get(self.day_type, 0.0) / ticks
+        vol = 0.009 / math.sqrt(ticks)
+        returns = self.rng.normal(drift, vol, ticks)
+        path = open_price * np.exp(np.cumsum(returns))
+
+        if self.day_type == 'range':
+            # Pull the path back towards the middle of the previous day's range
+            mid = (prev_high + prev_low) / 2
+            path = mid + (path - mid) * np.linspace(1, 0.5, ticks)
+
+        return np.round(path / 0.05) * 0.05
+
+    def _burst_mask(self, ticks, share, count):
+        # A fixed share of ticks, split into one burst per equal segment of the path
+        mask = np.zeros(ticks, dtype=bool)
+        segment = ticks // count if count else 0
+        length = int(ticks * share / count) if count else 0
+        for i in range(count if length else 0):
+            start = i * segment + self.rng.integers(0, segment - length + 1)
+            mask[start:start + length] = True
+        return mask
+
+    def _expiries(self):
+        # Weekly expiries on Tuesday
+        days_ahead = (1 - self.today.weekday()) % 7
+        first = self.today + timedelta(days=days_ahead)
+        return [first + timedelta(weeks=i) for i in range(4)]
+
+    @property
+    def open_price(self):
+        return float(self.path[0])
+
+    @property
+    def ltp(self):
+        return float(self.path[min(self.index, len(self.path) - 1)])
+
+    def in_burst(self):
+        return bool(self.bursts[min(self.index, len(self.bursts) - 1)])
+
+    def advance(self):
+        """Move to the next tick, return False when the session is over"""
+        if self.index >= len(self.path) - 1:
+            return False
+        self.index += 1
+        return True
+
+    def option_chain(self, expiry_date, strikecount):
+        spot = self.ltp
+        atm = round(spot / STRIKE_INTERVAL) * STRIKE_INTERVAL
+        days_to_expiry = (expiry_date - self.today).days
+        chain = [{'symbol': INDEX_SYMBOL, 'strike_price': -1, 'option_type': '', 'ltp': spot}]
+        for i in range(-strikecount, strikecount + 1):
+            strike = atm + i * STRIKE_INTERVAL
+            for option_type in ('CE', 'PE'):
+                chain.append({
+                    'symbol': weekly_option_symbol(expiry_date, strike, option_type),
+                    'strike_price': strike,
+                    'option_type': option_type,
+                    'ltp': round(option_price(spot, strike, days_to_expiry, self.iv, option_type), 2)
+                })
+        return chain
+
+    def quote(self, symbol):
+        if symbol == INDEX_SYMBOL:
+            return {'lp': self.ltp, 'open_price': self.open_price}
+        parsed = parse_weekly_option_symbol(symbol)
+        if parsed is None:
+            return None
+        expiry, strike, option_type = parsed
+        expiry_date = IST.localize(expiry)
+        if expiry_date not in self.expiries:
+            return None
+        days_to_expiry = (expiry_date - self.today).days
+        premium = option_price(self.ltp, strike, days_to_expiry, self.iv, option_type)
+        return {'lp': round(premium, 2), 'open_price': None}
+
+class MockFyers:
+    """Stand-in for fyersModel.FyersModel backed by a SyntheticMarket"""
+
+    def __init__(self, market, latency=0.0):
+        self.market = market
+        self.latency = latency
+        self.orders = []
+
+    def _wait(self):
+        if self.latency:
+            time.sleep(self.latency)
+
+    def history(self, data):
+        self._wait()
+        return {'s': 'ok', 'candles': [self.market.prev_candle]}
+
+    def quotes(self, data):
+        self._wait()
+        quotes = []
+        for symbol in data['symbols'].split(','):
+            quote = self.market.quote(symbol)
+            if quote is None:
+                return {'s': 'error', 'code': -300, 'message': f"Invalid symbol {symbol}"}
+            quotes.append({'n': symbol, 's': 'ok', 'v': quote})
+        return {'s': 'ok', 'd': quotes}
+
+    def optionchain(self, data):
+        self._wait()
+        expiry_data = [{'date': e.strftime('%d-%m-%Y'), 'expiry': str(int(e.timestamp()))}
+                       for e in self.market.expiries]
+        expiry_date = self.market.expiries[0]
+        if data.get('timestamp'):
+            expiry_date = datetime.fromtimestamp(int(data['timestamp']), IST)
+        return {
+            's': 'ok',
+            'data': {
+                'expiryData': expiry_data,
+                'optionsChain': self.market.option_chain(expiry_date, data.get('strikecount', 2))
+            }
+        }
+
+    def place_order(self, data):
+        self._wait()
+        self.orders.append(data)
+        return {'s': 'ok', 'code': 1101, 'id': str(len(self.orders))}
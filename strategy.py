@@ -2,6 +2,10 @@ from datetime import datetime,timedelta
 from fyers_api import *
 import pytz
 import pandas as pd
+import logging
+from metrics import inc_counter, set_gauge
+
+logger = logging.getLogger(__name__)
 
 # Indian timezone
 IST = pytz.timezone('Asia/Kolkata')
@@ -24,22 +28,31 @@ def calculate_quantity(capital, risk_pct, entry_price, stop_loss_price):
     if quantity < 1:
         quantity = 1
     
-    print(f"\nQuantity Calculation:")
-    print(f"  Capital: ₹{capital}")
-    print(f"  Risk %: {risk_pct}%")
-    print(f"  Risk Amount: ₹{risk_amount}")
-    print(f"  Entry Price: ₹{entry_price}")
-    print(f"  Stop Loss: ₹{stop_loss_price}")
-    print(f"  Price Difference: ₹{price_diff}")
-    print(f"  Calculated Quantity: {quantity}")
+    logger.info("Quantity calculated", extra={
+        'fields': {
+            'capital': capital,
+            'risk_pct': risk_pct,
+            'risk_amount': risk_amount,
+            'entry_price': entry_price,
+            'stop_loss': stop_loss_price,
+            'price_diff': price_diff,
+            'quantity': quantity
+        },
+        'console': "\nQuantity Calculation:\n"
+                   "  Capital: ₹{capital}\n"
+                   "  Risk %: {risk_pct}%\n"
+                   "  Risk Amount: ₹{risk_amount}\n"
+                   "  Entry Price: ₹{entry_price}\n"
+                   "  Stop Loss: ₹{stop_loss}\n"
+                   "  Price Difference: ₹{price_diff}\n"
+                   "  Calculated Quantity: {quantity}"
+    })
     
     return quantity
 
 def check_trade_day_conditions(prev_data):
     """Check if today qualifies as a trade day"""
-    print("\n" + "="*60)
-    print("Checking trade day conditions at 9:16:01...")
-    print("="*60)
+    logger.info("Checking trade day conditions at 9:16:01...", extra={'banner': True})
     
     prev_high = prev_data['prev_high']
     prev_low = prev_data['prev_low']
@@ -47,28 +60,36 @@ def check_trade_day_conditions(prev_data):
     prev_close = prev_data['prev_close']
     today_open = prev_data['today_open']
     
-    print(f"Previous Day - High: {prev_high}, Low: {prev_low}")
-    print(f"Previous Day - Open: {prev_open}, Close: {prev_close}")
-    print(f"Today's Open: {today_open}")
+    logger.info("Trade day inputs", extra={
+        'fields': {
+            'prev_high': prev_high,
+            'prev_low': prev_low,
+            'prev_open': prev_open,
+            'prev_close': prev_close,
+            'today_open': today_open
+        },
+        'console': "Previous Day - High: {prev_high}, Low: {prev_low}\n"
+                   "Previous Day - Open: {prev_open}, Close: {prev_close}\n"
+                   "Today's Open: {today_open}"
+    })
     
     # Condition 1: Today's open should be between prev high and low
     if not (prev_low <= today_open <= prev_high):
-        print(f"❌ Today's open {today_open} is NOT between prev high {prev_high} and low {prev_low}")
+        logger.info("❌ Today's open %s is NOT between prev high %s and low %s", today_open, prev_high, prev_low)
         return False
     
-    print(f"✓ Today's open is between prev high and low")
+    logger.info("✓ Today's open is between prev high and low")
     
     # Condition 2: ((prev_open - prev_close) * 100) / prev_close < 0.5
     prev_day_change_pct = abs(((prev_open - prev_close) * 100) / prev_open)
-    print(f"Previous day change %: {prev_day_change_pct:.2f}%")
+    logger.info("Previous day change %%: %.2f%%", prev_day_change_pct)
     
     if prev_day_change_pct > 0.5:
-        print(f"❌ Previous day change {prev_day_change_pct:.2f}% > 0.5%")
+        logger.info("❌ Previous day change %.2f%% > 0.5%%", prev_day_change_pct)
         return False
     
-    print(f"✓ Previous day change {prev_day_change_pct:.2f}% <= 0.5%")
-    print("✓✓ Today is a TRADE DAY!")
-    print("="*60 + "\n")
+    logger.info("✓ Previous day change %.2f%% <= 0.5%%", prev_day_change_pct)
+    logger.info("✓✓ Today is a TRADE DAY!", extra={'console': "✓✓ Today is a TRADE DAY!\n{rule}\n"})
     return True
 
 def check_entry_signal(ltp, prev_high, prev_low):
@@ -132,9 +153,7 @@ def enter_trade(fyers, symbol, capital, risk_pct, trade_type, ltp, prev_high, pr
     
     side = "BUY" if trade_type == "LONG" else "SELL"
     
-    print(f"\n{'='*60}")
-    print(f"🔔 ENTRY SIGNAL: {trade_type}")
-    print(f"{'='*60}")
+    logger.info("🔔 ENTRY SIGNAL: %s", trade_type, extra={'banner': True, 'fields': {'trade_type': trade_type}})
     
     #response = place_order(fyers, symbol, side, quantity)
     
@@ -144,8 +163,13 @@ def enter_trade(fyers, symbol, capital, risk_pct, trade_type, ltp, prev_high, pr
     expiries = get_option_chain_expiries(fyers)
     entry_option_price=0
     entry_option_symbol=None
+    entry_option_expiry=None
+    market_expiry=None
     if expiries:
-        selected_expiry = select_expiry(expiries)['expiry']
+        market_expiry = nearest_expiry(expiries)
+        selected = select_expiry(expiries)
+        selected_expiry = selected['expiry']
+        entry_option_expiry = selected['date']
         option_chain = get_option_chain_expiry(fyers,selected_expiry)
         strikes = get_itm_strike(ltp)
         if trade_type == 'LONG':
@@ -159,18 +183,32 @@ def enter_trade(fyers, symbol, capital, risk_pct, trade_type, ltp, prev_high, pr
         'entry_price': entry_price,
         'entry_option_price':entry_option_price,
         'entry_option_symbol':entry_option_symbol,
+        'entry_option_expiry':entry_option_expiry,
+        'market_expiry':market_expiry,
         'entry_datetime': entry_datetime,
         'stop_loss': stop_loss,
         'quantity': quantity
     }
     
-    print(f"✓ Trade Executed Successfully")
-    print(f"  Type: {trade_type}")
-    print(f"  Quantity: {quantity}")
-    print(f"  Entry Price: ₹{entry_price}")
-    print(f"  Entry Time: {entry_datetime.strftime('%Y-%m-%d %H:%M:%S')}")
-    print(f"  Stop Loss: ₹{stop_loss}")
-    print(f"{'='*60}\n")
+    logger.info("✓ Trade Executed Successfully", extra={
+        'keep': True,
+        'fields': {
+            'trade_type': trade_type,
+            'quantity': quantity,
+            'entry_price': entry_price,
+            'entry_datetime': entry_datetime.strftime('%Y-%m-%d %H:%M:%S'),
+            'stop_loss': stop_loss,
+            'entry_option_symbol': entry_option_symbol,
+            'entry_option_price': entry_option_price
+        },
+        'console': "✓ Trade Executed Successfully\n"
+                   "  Type: {trade_type}\n"
+                   "  Quantity: {quantity}\n"
+                   "  Entry Price: ₹{entry_price}\n"
+                   "  Entry Time: {entry_datetime}\n"
+                   "  Stop Loss: ₹{stop_loss}\n"
+                   "{rule}\n"
+    })
         
     return trade_details
     
@@ -239,16 +277,14 @@ def exit_trade(fyers, symbol, trade_details, ltp, reason="Stop Loss Hit",option_
         return False  # Exit failed
     """
     if trade_details is None:
-        print("⚠️  No active position to exit")
+        logger.warning("⚠️  No active position to exit")
         return False
     
     side = "SELL" if trade_details['type'] == "LONG" else "BUY"
     quantity = trade_details['quantity']
     exit_datetime = get_ist_time()
     
-    print(f"\n{'='*60}")
-    print(f"🔔 EXIT SIGNAL: {reason}")
-    print(f"{'='*60}")
+    logger.info("🔔 EXIT SIGNAL: %s", reason, extra={'banner': True, 'fields': {'exit_reason': reason}})
     
     #response = place_order(fyers, symbol, side, quantity)
     
@@ -271,6 +307,8 @@ def exit_trade(fyers, symbol, trade_details, ltp, reason="Stop Loss Hit",option_
         'entry_datetime': trade_details['entry_datetime'].strftime('%Y-%m-%d %H:%M:%S'),
         'entry_price': trade_details['entry_price'],
         'entry_option_symbol':trade_details['entry_option_symbol'],
+        'entry_option_expiry':trade_details['entry_option_expiry'],
+        'market_expiry':trade_details['market_expiry'],
         'entry_option_price':trade_details['entry_option_price'],
         'exit_datetime': exit_datetime.strftime('%Y-%m-%d %H:%M:%S'),
         'exit_price': exit_price,
@@ -285,22 +323,31 @@ def exit_trade(fyers, symbol, trade_details, ltp, reason="Stop Loss Hit",option_
     
     log_trade(log_entry)
     
+    # Every exit path (stop loss, manual, market close) goes through here
+    inc_counter('strategy_trades_exited_total', labels={'reason': reason})
+    set_gauge('strategy_position_open', 0)
+    set_gauge('strategy_position_mtm', 0)
+    
     return True  # Successfully exited
   
 
 def log_trade(trade_data):
     """Log trade details to console and file"""
-    print(f"✓ Exit Executed Successfully")
-    print(f"  Entry DateTime: {trade_data['entry_datetime']}")
-    print(f"  Entry Price: ₹{trade_data['entry_price']}")
-    print(f"  Exit DateTime: {trade_data['exit_datetime']}")
-    print(f"  Exit Price: ₹{trade_data['exit_price']}")
-    print(f"  Quantity: {trade_data['quantity']}")
-    print(f"  Profit (Absolute): ₹{trade_data['profit_absolute']}")
-    print(f"  Profit (Percentage): {trade_data['profit_percentage']}%")
-    print(f"  Trade Type: {trade_data['trade_type']}")
-    print(f"  Exit Reason: {trade_data['exit_reason']}")
-    print(f"{'='*60}\n")
+    logger.info("✓ Exit Executed Successfully", extra={
+        'keep': True,
+        'fields': trade_data,
+        'console': "✓ Exit Executed Successfully\n"
+                   "  Entry DateTime: {entry_datetime}\n"
+                   "  Entry Price: ₹{entry_price}\n"
+                   "  Exit DateTime: {exit_datetime}\n"
+                   "  Exit Price: ₹{exit_price}\n"
+                   "  Quantity: {quantity}\n"
+                   "  Profit (Absolute): ₹{profit_absolute}\n"
+                   "  Profit (Percentage): {profit_percentage}%\n"
+                   "  Trade Type: {trade_type}\n"
+                   "  Exit Reason: {exit_reason}\n"
+                   "{rule}\n"
+    })
     
     # Append to log file
     try:
@@ -311,9 +358,24 @@ def log_trade(trade_data):
             for key, value in trade_data.items():
                 f.write(f"{key}: {value}\n")
             f.write(f"{'='*60}\n")
-        print("✓ Trade logged to trade_log.txt")
+        logger.info("✓ Trade logged to trade_log.txt")
     except Exception as e:
-        print(f"Error writing to log file: {e}")
+        logger.error("Error writing to log file: %s", e)
+
+def nearest_expiry(expiry_data, current_date=None):
+    """Return the 'date' (dd-mm-YYYY) of the nearest expiry on or after today"""
+    if current_date is None:
+        current_date = datetime.now(IST).replace(hour=0, minute=0, second=0, microsecond=0)
+    
+    future_dates = []
+    for item in expiry_data:
+        expiry_date = IST.localize(datetime.strptime(item['date'], '%d-%m-%Y'))
+        if expiry_date >= current_date:
+            future_dates.append(expiry_date)
+    
+    if not future_dates:
+        return None
+    return min(future_dates).strftime('%d-%m-%Y')
 
 def select_expiry(expiry_data, current_date=None):
     """
@@ -334,7 +396,7 @@ def select_expiry(expiry_data, current_date=None):
     # Convert expiry dates to datetime objects and filter future dates
     future_expiries = []
     for item in expiry_data:
-        expiry_date = datetime.strptime(item['date'], '%d-%m-%Y')
+        expiry_date = IST.localize(datetime.strptime(item['date'], '%d-%m-%Y'))
         if expiry_date >= current_date:
             future_expiries.append({
                 'date': item['date'],